@@ -1,9 +1,18 @@
+import asyncio
+import hashlib
 import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import NamedTuple
 
+import aiohttp
+import msgspec
 import voluptuous as vol
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import llm
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.json import json_bytes
 from homeassistant.util.json import JsonObjectType
 
 from .cache import SQLiteCache
@@ -18,29 +27,243 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+ROUTES_API_URL = "https://routes.googleapis.com/directions/v2:computeRoutes"
+
+_FIELD_MASK = "routes.duration,routes.distanceMeters"
+
+_TIMEOUT = aiohttp.ClientTimeout(total=6.0, connect=1.5, sock_read=4.0)
+_RETRY_ATTEMPTS = 3
+_RETRY_BACKOFF = 0.2  # seconds, doubled after each failed attempt
+
+# Fields left at their API defaults are omitted to keep the request body small.
+# Routing preference is only accepted for these travel modes.
+_TRAFFIC_AWARE_BODY = {"routingPreference": "TRAFFIC_AWARE"}
+_TRAFFIC_AWARE_MODES = ("DRIVE", "TWO_WHEELER")
+
+
+class RoutesSettings(NamedTuple):
+    """Routes tool configuration, merged from the entry data and options."""
+
+    api_key: str | None
+    latitude: float | None
+    longitude: float | None
+    travel_mode: str
+    origin: dict | None
+
+
+def _parse_coordinate(value) -> float | None:
+    """Parse a configured coordinate, returning None when unset or invalid."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_settings(hass: HomeAssistant) -> RoutesSettings:
+    """Return the Routes settings, merged and parsed once each time the entry loads."""
+    domain_data = hass.data[DOMAIN]
+    settings = domain_data.get("routes_settings")
+    if settings is not None:
+        return settings
+
+    config_data = domain_data.get("config", {})
+    entries = hass.config_entries.async_entries(DOMAIN)
+    if entries and entries[0].options:
+        config_data = {**config_data, **entries[0].options}
+
+    latitude = _parse_coordinate(config_data.get(CONF_GOOGLE_PLACES_LATITUDE))
+    longitude = _parse_coordinate(config_data.get(CONF_GOOGLE_PLACES_LONGITUDE))
+    settings = domain_data["routes_settings"] = RoutesSettings(
+        api_key=config_data.get(CONF_GOOGLE_PLACES_API_KEY),
+        latitude=latitude,
+        longitude=longitude,
+        travel_mode=config_data.get(
+            CONF_GOOGLE_ROUTES_TRAVEL_MODE,
+            SERVICE_DEFAULTS.get(CONF_GOOGLE_ROUTES_TRAVEL_MODE),
+        ),
+        origin=(
+            None
+            if latitude is None or longitude is None
+            else _build_origin(latitude, longitude)
+        ),
+    )
+    return settings
+
+
+_PLURAL = ("", "s")
+
+
+def _format_duration(seconds: int) -> str:
+    """Format a duration in seconds as human readable hours and minutes."""
+    hours, remainder = divmod(seconds, 3600)
+    minutes = remainder // 60
+    minutes_text = f"{minutes} minute{_PLURAL[minutes != 1]}"
+    if hours:
+        return f"{hours} hour{_PLURAL[hours != 1]} {minutes_text}"
+    return minutes_text
+
+
+class Route(msgspec.Struct, rename="camel"):
+    """A single route from a Routes API response, limited to the field mask."""
+
+    duration: str = "0s"
+    distance_meters: int = 0
+
+
+class RoutesResponse(msgspec.Struct):
+    """A Routes API computeRoutes response."""
+
+    routes: list[Route] = []
+
+
+_ROUTES_DECODER = msgspec.json.Decoder(RoutesResponse)
+
+
+def _parse_route(raw: bytes) -> tuple[int, int] | None:
+    """Extract the first route's duration in seconds and distance in metres."""
+    routes = _ROUTES_DECODER.decode(raw).routes
+    if not routes:
+        return None
+
+    route = routes[0]
+    duration_seconds = int(route.duration.removesuffix("s"))
+    return duration_seconds, route.distance_meters
+
+
+# In-memory layer in front of the SQLite cache for repeated queries within a short window
+_HOT_TTL = 60
+_HOT_MAX_SIZE = 128
+_HOT: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
+
+def _hot_get(key: bytes) -> dict | None:
+    """Return a recent result from the in-memory cache, if still fresh."""
+    entry = _HOT.get(key)
+    if entry is None:
+        return None
+
+    if time.monotonic() - entry[0] >= _HOT_TTL:
+        del _HOT[key]
+        return None
+
+    return entry[1]
+
+
+def _hot_set(key: bytes, value: dict) -> None:
+    """Store a result in the in-memory cache, evicting the oldest entry when full."""
+    _HOT[key] = (time.monotonic(), value)
+    _HOT.move_to_end(key)
+    if len(_HOT) > _HOT_MAX_SIZE:
+        _HOT.popitem(last=False)
+
+
+# Lookups in progress, so concurrent calls for the same route share one API request
+_INFLIGHT: dict[bytes, asyncio.Task] = {}
+
+
+async def _async_get_cache(hass: HomeAssistant) -> SQLiteCache:
+    """Return the shared cache, opening it in the executor if not yet created."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cache = domain_data.get("cache")
+    if cache is None:
+        cache = domain_data["cache"] = await hass.async_add_executor_job(SQLiteCache)
+    return cache
+
+
+def _build_origin(latitude: float, longitude: float) -> dict:
+    """Build the request origin for the configured coordinates."""
+    return {
+        "location": {
+            "latLng": {
+                # 6 decimal places is ~10cm, further precision only adds bytes
+                "latitude": round(latitude, 6),
+                "longitude": round(longitude, 6),
+            }
+        }
+    }
+
+
+@lru_cache(maxsize=4)
+def _build_headers(api_key: str, field_mask: str) -> dict[str, str]:
+    """Build the Routes API request headers for an API key and field mask."""
+    return {
+        "Content-Type": "application/json",
+        "X-Goog-Api-Key": api_key,
+        "X-Goog-FieldMask": field_mask,
+    }
+
+
+def _cache_key(
+    destination: str, latitude: float, longitude: float, travel_mode: str
+) -> bytes:
+    """Derive the cache key for a route request without building the request body."""
+    return hashlib.blake2b(
+        json_bytes((destination, latitude, longitude, travel_mode)), digest_size=16
+    ).digest()
+
+
+def _build_body(destination: str, origin: dict, travel_mode: str) -> bytes:
+    """Build and encode the Routes API request body."""
+    body = {
+        "origin": origin,
+        "destination": {"address": destination},
+        "travelMode": travel_mode,
+    }
+    if travel_mode in _TRAFFIC_AWARE_MODES:
+        body.update(_TRAFFIC_AWARE_BODY)
+
+    return json_bytes(body)
+
+
+async def _async_request_route(
+    session: aiohttp.ClientSession, data: bytes, headers: dict[str, str]
+) -> tuple[int, bytes | None]:
+    """Send a Routes API request, retrying connection errors and timeouts with backoff."""
+    attempt = 0
+    while True:
+        try:
+            async with session.post(
+                ROUTES_API_URL, data=data, headers=headers, timeout=_TIMEOUT
+            ) as resp:
+                if resp.status == 200:
+                    return resp.status, await resp.read()
+
+                # Only read the error body when it will actually be logged
+                if _LOGGER.isEnabledFor(logging.ERROR):
+                    _LOGGER.error(
+                        "Routes API received a HTTP %s error from Google: %s",
+                        resp.status,
+                        await resp.text(),
+                    )
+                return resp.status, None
+        except (aiohttp.ClientConnectionError, TimeoutError) as e:
+            attempt += 1
+            if attempt >= _RETRY_ATTEMPTS:
+                raise
+
+            _LOGGER.debug("Routes API request failed, retrying: %s", e)
+            await asyncio.sleep(_RETRY_BACKOFF * 2 ** (attempt - 1))
+
 
 class GetTransitTimesTool(llm.Tool):
     """Tool for getting transit times to places."""
 
     name = "get_transit_times"
 
-    description = "\n".join(
-        [
-            "Use this tool to get transit times and routes when the user requests or infers they want to know:",
-            "- How long it takes to get to a place",
-            "- Transit time to a destination",
-            "- Directions or route to a location",
-            "- When they should leave to arrive at a place",
-        ]
+    description = (
+        "Use this tool to get transit times and routes when the user requests or infers they want to know:\n"
+        "- How long it takes to get to a place\n"
+        "- Transit time to a destination\n"
+        "- Directions or route to a location\n"
+        "- When they should leave to arrive at a place"
     )
 
-    response_directive = "\n".join(
-        [
-            "Use the route information to answer the user's query.",
-            "Focus on the transit time and relevant route details the user is interested in.",
-        ]
+    response_directive = (
+        "Use the route information to answer the user's query.\n"
+        "Focus on the transit time and relevant route details the user is interested in."
     )
 
+    # Used for schema discovery by the LLM, the call itself validates its arguments inline
     parameters = vol.Schema(
         {
             vol.Required(
@@ -56,106 +279,94 @@ class GetTransitTimesTool(llm.Tool):
         llm_context: llm.LLMContext,
     ) -> JsonObjectType:
         """Call the tool."""
-        config_data = hass.data[DOMAIN].get("config", {})
-        entry = next(iter(hass.config_entries.async_entries(DOMAIN)))
-        config_data = {**config_data, **entry.options}
+        destination = tool_input.tool_args.get("destination")
+        if not isinstance(destination, str) or not destination:
+            return {"error": "A destination is required"}
 
-        destination = tool_input.tool_args["destination"]
-
-        api_key = config_data.get(CONF_GOOGLE_PLACES_API_KEY)
-        latitude = config_data.get(CONF_GOOGLE_PLACES_LATITUDE)
-        longitude = config_data.get(CONF_GOOGLE_PLACES_LONGITUDE)
-        travel_mode = config_data.get(
-            CONF_GOOGLE_ROUTES_TRAVEL_MODE,
-            SERVICE_DEFAULTS.get(CONF_GOOGLE_ROUTES_TRAVEL_MODE),
-        )
+        settings = _get_settings(hass)
 
+        # Validate configuration before doing any other work
+        api_key = settings.api_key
         if not api_key:
             return {"error": "Google Routes API key not configured"}
 
-        if not latitude or not longitude:
+        if settings.origin is None:
             return {"error": "Origin location (latitude/longitude) not configured"}
 
-        try:
-            session = async_get_clientsession(hass)
+        travel_mode = settings.travel_mode
 
-            # Build the request body for Routes API
-            request_body = {
-                "origin": {
-                    "location": {
-                        "latLng": {
-                            "latitude": float(latitude),
-                            "longitude": float(longitude),
-                        }
-                    }
-                },
-                "destination": {"address": destination},
-                "travelMode": travel_mode,
-                "routingPreference": "TRAFFIC_AWARE",
-                "computeAlternativeRoutes": False,
-                "languageCode": "en-US",
-                "units": "METRIC",
-            }
+        cache_key = _cache_key(
+            destination, settings.latitude, settings.longitude, travel_mode
+        )
+        hot_response = _hot_get(cache_key)
+        if hot_response:
+            return hot_response
 
-            cache = SQLiteCache()
-            cached_response = cache.get(__name__, request_body)
+        lookup = _INFLIGHT.get(cache_key)
+        if lookup is None:
+            lookup = _INFLIGHT[cache_key] = hass.async_create_task(
+                self._async_lookup(
+                    hass,
+                    cache_key,
+                    api_key,
+                    settings.origin,
+                    travel_mode,
+                    destination,
+                ),
+                f"{DOMAIN} route lookup",
+            )
+            lookup.add_done_callback(lambda _: _INFLIGHT.pop(cache_key, None))
+
+        # Shield the shared lookup so a cancelled caller does not cancel it for the others
+        return await asyncio.shield(lookup)
+
+    async def _async_lookup(
+        self,
+        hass: HomeAssistant,
+        cache_key: bytes,
+        api_key: str,
+        origin: dict,
+        travel_mode: str,
+        destination: str,
+    ) -> JsonObjectType:
+        """Look up a route in the cache, falling back to the Routes API."""
+        try:
+            cache = await _async_get_cache(hass)
+
+            # Encode the request body while the cache lookup runs in the executor
+            cache_lookup = hass.async_add_executor_job(cache.get, __name__, cache_key)
+            request_data = _build_body(destination, origin, travel_mode)
+            cached_response = await cache_lookup
             if cached_response:
+                _hot_set(cache_key, cached_response)
                 return cached_response
 
-            field_mask = ",".join(
-                [
-                    "routes.duration",
-                    "routes.distanceMeters",
-                ]
+            session = async_get_clientsession(hass)
+
+            status, raw = await _async_request_route(
+                session, request_data, _build_headers(api_key, _FIELD_MASK)
             )
+            if status != 200:
+                return {"error": f"Routes API error: {status}"}
 
-            headers = {
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": api_key,
-                "X-Goog-FieldMask": field_mask,
+            route = _parse_route(raw)
+            if route is None:
+                return {"result": "No route found to destination"}
+
+            duration_seconds, distance_meters = route
+            distance_km = distance_meters / 1000
+
+            result = {
+                "destination": destination,
+                "travel_mode": travel_mode.lower().replace("_", " "),
+                "duration": _format_duration(duration_seconds),
+                "distance": f"{distance_km:.1f} km",
+                "instruction": self.response_directive,
             }
 
-            async with session.post(
-                "https://routes.googleapis.com/directions/v2:computeRoutes",
-                json=request_body,
-                headers=headers,
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    routes = data.get("routes", [])
-
-                    if not routes:
-                        return {"result": "No route found to destination"}
-
-                    route = routes[0]
-                    duration_seconds = int(route.get("duration", "0s").rstrip("s"))
-                    distance_meters = route.get("distanceMeters", 0)
-
-                    # Convert to human readable format
-                    hours = duration_seconds // 3600
-                    minutes = (duration_seconds % 3600) // 60
-                    distance_km = distance_meters / 1000
-
-                    if hours > 0:
-                        duration_text = f"{hours} hour{'s' if hours != 1 else ''} {minutes} minute{'s' if minutes != 1 else ''}"
-                    else:
-                        duration_text = f"{minutes} minute{'s' if minutes != 1 else ''}"
-
-                    result = {
-                        "destination": destination,
-                        "travel_mode": travel_mode.lower().replace("_", " "),
-                        "duration": duration_text,
-                        "distance": f"{distance_km:.1f} km",
-                        "instruction": self.response_directive,
-                    }
-
-                    cache.set(__name__, request_body, result)
-                    return result
-
-                _LOGGER.error(
-                    f"Routes API received a HTTP {resp.status} error from Google: {await resp.text()}"
-                )
-                return {"error": f"Routes API error: {resp.status}"}
+            _hot_set(cache_key, result)
+            await hass.async_add_executor_job(cache.set, __name__, cache_key, result)
+            return result
 
         except Exception as e:
             _LOGGER.error("Routes API error: %s", e)
@@ -8,6 +8,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 
+from .cache import SQLiteCache
 from .const import ADDON_NAME
 from .llm_functions import cleanup_llm_functions, setup_llm_functions
 
@@ -27,6 +28,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Tools for Assist from a config entry."""
     _LOGGER.info(f"Setting up {ADDON_NAME} for entry: %s", entry.entry_id)
     await setup_llm_functions(hass, entry.data)
+    # Open the cache once up front so tool calls reuse the same connection
+    hass.data[DOMAIN]["cache"] = await hass.async_add_executor_job(SQLiteCache)
     _LOGGER.info(f"{ADDON_NAME} functions successfully set up")
     return True
 
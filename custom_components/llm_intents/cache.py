@@ -3,6 +3,7 @@ import json
 import logging
 import os
 import sqlite3
+import threading
 import time
 from typing import Any
 
@@ -12,6 +13,7 @@ logger = logging.getLogger(__name__)
 class SQLiteCache:
     _instance = None
     DEFAULT_MAX_AGE = 7200  # 2 hour
+    CLEANUP_INTERVAL = 300  # 5 minutes
 
     def __new__(cls):
         if cls._instance is None:
@@ -24,11 +26,17 @@ class SQLiteCache:
         db_path = os.path.join(base_dir, "cache.db")
         os.makedirs(base_dir, exist_ok=True)  # ensure folder exists
 
-        if os.path.exists(db_path):
-            # Recreate cache file when addon is initialised
-            os.remove(db_path)
+        # Recreate cache file when addon is initialised, including any WAL leftovers
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
 
-        self._conn = sqlite3.connect(db_path)
+        # Calls may come from executor threads, so share the connection under a lock
+        self._lock = threading.Lock()
+        self._last_cleanup = 0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
         self._conn.execute("""
             CREATE TABLE IF NOT EXISTS cache (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -39,7 +47,11 @@ class SQLiteCache:
         """)
         self._conn.commit()
 
-    def _make_key(self, tool: str, params: dict | None) -> str:
+    def _make_key(self, tool: str, params: dict | bytes | None) -> str:
+        if isinstance(params, bytes):
+            # Callers passing bytes have already derived a stable key
+            return f"{tool}:{params.hex()}"
+
         params_str = (
             ""
             if params is None
@@ -50,6 +62,10 @@ class SQLiteCache:
 
     def _cleanup(self):
         now = int(time.time())
+        if now - self._last_cleanup < self.CLEANUP_INTERVAL:
+            return
+
+        self._last_cleanup = now
         cutoff = now - self.DEFAULT_MAX_AGE
         deleted = self._conn.execute(
             "DELETE FROM cache WHERE created_at < ?", (cutoff,)
@@ -58,11 +74,16 @@ class SQLiteCache:
         if deleted:
             logger.debug(f"Cache cleanup ran, deleted {deleted} expired entries")
 
-    def get(self, tool: str, params: dict | None) -> Any | None:
-        self._cleanup()
+    def get(self, tool: str, params: dict | bytes | None) -> Any | None:
         key = self._make_key(tool, params)
-        cursor = self._conn.execute("SELECT data FROM cache WHERE key = ?", (key,))
-        row = cursor.fetchone()
+        with self._lock:
+            self._cleanup()
+            # Cleanup is throttled, so expired rows are filtered out here as well
+            cursor = self._conn.execute(
+                "SELECT data FROM cache WHERE key = ? AND created_at >= ?",
+                (key, int(time.time()) - self.DEFAULT_MAX_AGE),
+            )
+            row = cursor.fetchone()
         if row:
             logger.debug(f"Cache hit for tool: {tool} Params: {params}")
             try:
@@ -76,18 +97,19 @@ class SQLiteCache:
             logger.debug(f"Cache miss for tool: {tool} Params: {params}")
             return None
 
-    def set(self, tool: str, params: dict | None, data: dict):
+    def set(self, tool: str, params: dict | bytes | None, data: dict):
         key = self._make_key(tool, params)
         created_at = int(time.time())
         data_json = json.dumps(data)
-        self._conn.execute(
-            """
-            INSERT INTO cache (key, created_at, data)
-            VALUES (?, ?, ?)
-            ON CONFLICT(key) DO UPDATE SET
-                created_at=excluded.created_at,
-                data=excluded.data
-        """,
-            (key, created_at, data_json),
-        )
-        self._conn.commit()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO cache (key, created_at, data)
+                VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    created_at=excluded.created_at,
+                    data=excluded.data
+            """,
+                (key, created_at, data_json),
+            )
+            self._conn.commit()
@@ -0,0 +1,92 @@
+"""Test the SQLite cache."""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.llm_intents.cache import SQLiteCache
+
+NOW = 1_000_000
+
+
+class TestSQLiteCache:
+    """Test the SQLite cache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a fresh cache backed by a database in a temporary directory."""
+        SQLiteCache._instance = None
+        with patch(
+            "custom_components.llm_intents.cache.os.path.abspath",
+            return_value=str(tmp_path / "cache.py"),
+        ):
+            cache = SQLiteCache()
+
+        yield cache
+
+        cache._conn.close()
+        SQLiteCache._instance = None
+
+    def test_bytes_key_round_trip(self, cache):
+        """Test that data stored under a bytes key is returned for the same key."""
+        cache.set("tool", b"\x01\x02", {"result": "value"})
+
+        assert cache.get("tool", b"\x01\x02") == {"result": "value"}
+        assert cache.get("tool", b"\x01\x03") is None
+        assert cache.get("other_tool", b"\x01\x02") is None
+
+    def test_dict_key_round_trip(self, cache):
+        """Test that dict params still key the cache."""
+        cache.set("tool", {"query": "test"}, {"result": "value"})
+
+        assert cache.get("tool", {"query": "test"}) == {"result": "value"}
+        assert cache.get("tool", {"query": "other"}) is None
+
+    def test_expired_row_not_returned_before_cleanup(self, cache):
+        """Test that expired rows are filtered out while cleanup is throttled."""
+        with patch("custom_components.llm_intents.cache.time.time") as mock_time:
+            # Run cleanup now, so it is throttled for the next lookup
+            mock_time.return_value = NOW
+            cache.get("tool", b"key")
+
+            mock_time.return_value = NOW - cache.DEFAULT_MAX_AGE - 1
+            cache.set("tool", b"key", {"result": "stale"})
+
+            mock_time.return_value = NOW + 1
+            assert cache.get("tool", b"key") is None
+
+        # The row is still stored, it has only been filtered from the lookup
+        (count,) = cache._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        assert count == 1
+
+    def test_cleanup_throttled(self, cache):
+        """Test that cleanup runs at most once per cleanup interval."""
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+
+        with patch("custom_components.llm_intents.cache.time.time") as mock_time:
+            for now in (
+                NOW,
+                NOW + 1,
+                NOW + cache.CLEANUP_INTERVAL - 1,
+                NOW + cache.CLEANUP_INTERVAL,
+            ):
+                mock_time.return_value = now
+                cache.get("tool", b"key")
+
+        deletes = [s for s in statements if s.lstrip().startswith("DELETE")]
+        assert len(deletes) == 2
+
+    def test_access_from_another_thread(self, cache):
+        """Test that the cache can be used from executor threads."""
+        cache.set("tool", b"key", {"result": "value"})
+        results = []
+
+        thread = threading.Thread(
+            target=lambda: results.append(cache.get("tool", b"key"))
+        )
+        thread.start()
+        thread.join()
+
+        assert results == [{"result": "value"}]
@@ -1,30 +1,62 @@
 """Test the Google Routes tool."""
 
+import asyncio
+import json
 from unittest.mock import AsyncMock, Mock, patch
 
+import aiohttp
 import pytest
+from aioresponses import aioresponses
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import llm
+from yarl import URL
 
 from custom_components.llm_intents.const import (
-    CONF_GOOGLE_ROUTES_API_KEY,
+    CONF_GOOGLE_PLACES_API_KEY,
+    CONF_GOOGLE_PLACES_LATITUDE,
+    CONF_GOOGLE_PLACES_LONGITUDE,
     CONF_GOOGLE_ROUTES_ENABLED,
-    CONF_GOOGLE_ROUTES_LATITUDE,
-    CONF_GOOGLE_ROUTES_LONGITUDE,
     CONF_GOOGLE_ROUTES_TRAVEL_MODE,
     DOMAIN,
 )
-from custom_components.llm_intents.GoogleRoutes import GetTransitTimesTool
+from custom_components.llm_intents.GoogleRoutes import (
+    _HOT,
+    _HOT_MAX_SIZE,
+    _HOT_TTL,
+    ROUTES_API_URL,
+    GetTransitTimesTool,
+    _build_body,
+    _build_origin,
+    _cache_key,
+    _format_duration,
+    _get_settings,
+    _hot_get,
+    _hot_set,
+    _parse_route,
+)
 
 
 class TestGoogleRoutes:
     """Test Google Routes tool."""
 
+    @pytest.fixture(autouse=True)
+    def clear_hot_cache(self):
+        """Ensure results from one test are not served from memory in another."""
+        _HOT.clear()
+        yield
+        _HOT.clear()
+
     @pytest.fixture
     def hass(self):
         """Create a mock Home Assistant instance."""
         hass = Mock(spec=HomeAssistant)
         hass.data = {}
+        hass.async_add_executor_job = AsyncMock(
+            side_effect=lambda target, *args: target(*args)
+        )
+        hass.async_create_task = Mock(
+            side_effect=lambda target, *args, **kwargs: asyncio.ensure_future(target)
+        )
 
         # Mock config entry
         mock_entry = Mock()
@@ -39,12 +71,58 @@ class TestGoogleRoutes:
         """Create test configuration data."""
         return {
             CONF_GOOGLE_ROUTES_ENABLED: True,
-            CONF_GOOGLE_ROUTES_API_KEY: "test_routes_key",
-            CONF_GOOGLE_ROUTES_LATITUDE: "40.7128",
-            CONF_GOOGLE_ROUTES_LONGITUDE: "-74.0060",
+            CONF_GOOGLE_PLACES_API_KEY: "test_routes_key",
+            CONF_GOOGLE_PLACES_LATITUDE: "40.7128",
+            CONF_GOOGLE_PLACES_LONGITUDE: "-74.0060",
             CONF_GOOGLE_ROUTES_TRAVEL_MODE: "DRIVE",
         }
 
+    @pytest.fixture
+    def tool_input(self):
+        """Create a tool input for a destination."""
+        tool_input = Mock(spec=llm.ToolInput)
+        tool_input.tool_args = {"destination": "Times Square"}
+        return tool_input
+
+    @pytest.fixture
+    def llm_context(self):
+        """Create a mock LLM context."""
+        return Mock(spec=llm.LLMContext)
+
+    @pytest.fixture
+    def mock_cache(self):
+        """Replace the SQLite cache with an empty in-memory mock."""
+        with patch(
+            "custom_components.llm_intents.GoogleRoutes.SQLiteCache"
+        ) as mock_cache:
+            mock_cache_instance = Mock()
+            mock_cache_instance.get = Mock(return_value=None)
+            mock_cache_instance.set = Mock()
+            mock_cache.return_value = mock_cache_instance
+            yield mock_cache_instance
+
+    @pytest.fixture
+    async def mock_routes_session(self):
+        """Intercept Routes API requests, returning the mock and a response setter."""
+        with aioresponses() as mocked:
+            session = aiohttp.ClientSession()
+
+            def set_response(payload=None, status=200, **kwargs):
+                mocked.post(ROUTES_API_URL, status=status, payload=payload, **kwargs)
+
+            with patch(
+                "custom_components.llm_intents.GoogleRoutes.async_get_clientsession",
+                return_value=session,
+            ):
+                yield mocked, set_response
+
+            await session.close()
+
+    @staticmethod
+    def routes_requests(mocked):
+        """Return the requests sent to the Routes API."""
+        return mocked.requests.get(("POST", URL(ROUTES_API_URL)), [])
+
     async def test_tool_initialization(self):
         """Test that the tool initializes with correct properties."""
         tool = GetTransitTimesTool()
@@ -54,18 +132,14 @@ class TestGoogleRoutes:
         assert "route" in tool.description.lower()
         assert tool.parameters is not None
 
-    async def test_get_transit_times_success(self, hass, config_data):
+    async def test_get_transit_times_success(
+        self, hass, config_data, llm_context, mock_cache, mock_routes_session
+    ):
         """Test successful route calculation."""
         hass.data[DOMAIN] = {"config": config_data}
-
-        tool = GetTransitTimesTool()
-
-        # Mock the HTTP response
-        mock_session = AsyncMock()
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(
-            return_value={
+        mocked, set_response = mock_routes_session
+        set_response(
+            {
                 "routes": [
                     {
                         "duration": "1200s",
@@ -81,192 +155,123 @@ class TestGoogleRoutes:
             }
         )
 
-        class MockContext:
-            def __init__(self, response):
-                self.response = response
-
-            async def __aenter__(self):
-                return self.response
-
-            async def __aexit__(self, *args):
-                return None
-
-        def mock_post(*args, **kwargs):
-            return MockContext(mock_response)
-
-        mock_session.post = mock_post
+        tool = GetTransitTimesTool()
 
         tool_input = Mock(spec=llm.ToolInput)
         tool_input.tool_args = {"destination": "Times Square, New York"}
 
-        llm_context = Mock(spec=llm.LLMContext)
-
-        with patch(
-            "custom_components.llm_intents.GoogleRoutes.async_get_clientsession",
-            return_value=mock_session,
-        ), patch(
-            "custom_components.llm_intents.GoogleRoutes.SQLiteCache"
-        ) as mock_cache:
-            mock_cache_instance = Mock()
-            mock_cache_instance.get = Mock(return_value=None)
-            mock_cache_instance.set = Mock()
-            mock_cache.return_value = mock_cache_instance
+        result = await tool.async_call(hass, tool_input, llm_context)
 
-            result = await tool.async_call(hass, tool_input, llm_context)
+        assert "destination" in result
+        assert "duration" in result
+        assert "distance" in result
+        assert result["destination"] == "Times Square, New York"
+        assert "20 minute" in result["duration"]
+        assert "5.0 km" in result["distance"]
 
-            assert "destination" in result
-            assert "duration" in result
-            assert "distance" in result
-            assert result["destination"] == "Times Square, New York"
-            assert "20 minute" in result["duration"]
-            assert "5.0 km" in result["distance"]
+        request = self.routes_requests(mocked)[0]
+        assert request.kwargs["headers"]["X-Goog-Api-Key"] == "test_routes_key"
+        mock_cache.set.assert_called_once()
 
-    async def test_get_transit_times_no_api_key(self, hass):
+    async def test_get_transit_times_no_api_key(self, hass, tool_input, llm_context):
         """Test error when API key is not configured."""
         hass.data[DOMAIN] = {
             "config": {
                 CONF_GOOGLE_ROUTES_ENABLED: True,
-                CONF_GOOGLE_ROUTES_LATITUDE: "40.7128",
-                CONF_GOOGLE_ROUTES_LONGITUDE: "-74.0060",
+                CONF_GOOGLE_PLACES_LATITUDE: "40.7128",
+                CONF_GOOGLE_PLACES_LONGITUDE: "-74.0060",
             }
         }
 
         tool = GetTransitTimesTool()
 
-        tool_input = Mock(spec=llm.ToolInput)
-        tool_input.tool_args = {"destination": "Times Square"}
-
-        llm_context = Mock(spec=llm.LLMContext)
-
         result = await tool.async_call(hass, tool_input, llm_context)
 
         assert "error" in result
         assert "API key not configured" in result["error"]
 
-    async def test_get_transit_times_no_origin(self, hass):
+    async def test_get_transit_times_no_origin(self, hass, tool_input, llm_context):
         """Test error when origin location is not configured."""
         hass.data[DOMAIN] = {
             "config": {
                 CONF_GOOGLE_ROUTES_ENABLED: True,
-                CONF_GOOGLE_ROUTES_API_KEY: "test_key",
+                CONF_GOOGLE_PLACES_API_KEY: "test_key",
             }
         }
 
         tool = GetTransitTimesTool()
 
-        tool_input = Mock(spec=llm.ToolInput)
-        tool_input.tool_args = {"destination": "Times Square"}
-
-        llm_context = Mock(spec=llm.LLMContext)
-
         result = await tool.async_call(hass, tool_input, llm_context)
 
         assert "error" in result
         assert "Origin location" in result["error"]
 
-    async def test_get_transit_times_no_route_found(self, hass, config_data):
-        """Test when no route is found."""
+    async def test_get_transit_times_no_destination(
+        self, hass, config_data, llm_context
+    ):
+        """Test error when no usable destination is given."""
         hass.data[DOMAIN] = {"config": config_data}
 
         tool = GetTransitTimesTool()
 
-        mock_session = AsyncMock()
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"routes": []})
-
-        class MockContext:
-            def __init__(self, response):
-                self.response = response
+        for tool_args in ({}, {"destination": ""}, {"destination": 123}):
+            tool_input = Mock(spec=llm.ToolInput)
+            tool_input.tool_args = tool_args
 
-            async def __aenter__(self):
-                return self.response
+            result = await tool.async_call(hass, tool_input, llm_context)
 
-            async def __aexit__(self, *args):
-                return None
+            assert "error" in result
+            assert "destination" in result["error"]
 
-        def mock_post(*args, **kwargs):
-            return MockContext(mock_response)
+    async def test_get_transit_times_no_route_found(
+        self, hass, config_data, llm_context, mock_cache, mock_routes_session
+    ):
+        """Test when no route is found."""
+        hass.data[DOMAIN] = {"config": config_data}
+        _, set_response = mock_routes_session
+        set_response({"routes": []})
 
-        mock_session.post = mock_post
+        tool = GetTransitTimesTool()
 
         tool_input = Mock(spec=llm.ToolInput)
         tool_input.tool_args = {"destination": "Invalid Place"}
 
-        llm_context = Mock(spec=llm.LLMContext)
-
-        with patch(
-            "custom_components.llm_intents.GoogleRoutes.async_get_clientsession",
-            return_value=mock_session,
-        ), patch(
-            "custom_components.llm_intents.GoogleRoutes.SQLiteCache"
-        ) as mock_cache:
-            mock_cache_instance = Mock()
-            mock_cache_instance.get = Mock(return_value=None)
-            mock_cache.return_value = mock_cache_instance
-
-            result = await tool.async_call(hass, tool_input, llm_context)
-
-            assert "result" in result
-            assert "No route found" in result["result"]
+        result = await tool.async_call(hass, tool_input, llm_context)
 
-    async def test_get_transit_times_api_error(self, hass, config_data):
+        assert "result" in result
+        assert "No route found" in result["result"]
+
+    async def test_get_transit_times_api_error(
+        self,
+        hass,
+        config_data,
+        tool_input,
+        llm_context,
+        mock_cache,
+        mock_routes_session,
+    ):
         """Test handling of API errors."""
         hass.data[DOMAIN] = {"config": config_data}
+        mocked, set_response = mock_routes_session
+        set_response(status=500, body="Internal Server Error")
 
         tool = GetTransitTimesTool()
 
-        mock_session = AsyncMock()
-        mock_response = AsyncMock()
-        mock_response.status = 500
-        mock_response.text = AsyncMock(return_value="Internal Server Error")
-
-        class MockContext:
-            def __init__(self, response):
-                self.response = response
-
-            async def __aenter__(self):
-                return self.response
-
-            async def __aexit__(self, *args):
-                return None
-
-        def mock_post(*args, **kwargs):
-            return MockContext(mock_response)
-
-        mock_session.post = mock_post
-
-        tool_input = Mock(spec=llm.ToolInput)
-        tool_input.tool_args = {"destination": "Times Square"}
-
-        llm_context = Mock(spec=llm.LLMContext)
-
-        with patch(
-            "custom_components.llm_intents.GoogleRoutes.async_get_clientsession",
-            return_value=mock_session,
-        ), patch(
-            "custom_components.llm_intents.GoogleRoutes.SQLiteCache"
-        ) as mock_cache:
-            mock_cache_instance = Mock()
-            mock_cache_instance.get = Mock(return_value=None)
-            mock_cache.return_value = mock_cache_instance
-
-            result = await tool.async_call(hass, tool_input, llm_context)
+        result = await tool.async_call(hass, tool_input, llm_context)
 
-            assert "error" in result
-            assert "500" in result["error"]
+        assert "error" in result
+        assert "500" in result["error"]
+        # HTTP errors are not retried
+        assert len(self.routes_requests(mocked)) == 1
 
-    async def test_get_transit_times_with_hours(self, hass, config_data):
+    async def test_get_transit_times_with_hours(
+        self, hass, config_data, llm_context, mock_cache, mock_routes_session
+    ):
         """Test duration formatting with hours."""
         hass.data[DOMAIN] = {"config": config_data}
-
-        tool = GetTransitTimesTool()
-
-        mock_session = AsyncMock()
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(
-            return_value={
+        _, set_response = mock_routes_session
+        set_response(
+            {
                 "routes": [
                     {
                         "duration": "7200s",  # 2 hours
@@ -276,106 +281,228 @@ class TestGoogleRoutes:
             }
         )
 
-        class MockContext:
-            def __init__(self, response):
-                self.response = response
-
-            async def __aenter__(self):
-                return self.response
-
-            async def __aexit__(self, *args):
-                return None
-
-        def mock_post(*args, **kwargs):
-            return MockContext(mock_response)
-
-        mock_session.post = mock_post
+        tool = GetTransitTimesTool()
 
         tool_input = Mock(spec=llm.ToolInput)
         tool_input.tool_args = {"destination": "Boston"}
 
-        llm_context = Mock(spec=llm.LLMContext)
-
-        with patch(
-            "custom_components.llm_intents.GoogleRoutes.async_get_clientsession",
-            return_value=mock_session,
-        ), patch(
-            "custom_components.llm_intents.GoogleRoutes.SQLiteCache"
-        ) as mock_cache:
-            mock_cache_instance = Mock()
-            mock_cache_instance.get = Mock(return_value=None)
-            mock_cache_instance.set = Mock()
-            mock_cache.return_value = mock_cache_instance
-
-            result = await tool.async_call(hass, tool_input, llm_context)
+        result = await tool.async_call(hass, tool_input, llm_context)
 
-            assert "2 hours 0 minutes" in result["duration"]
+        assert "2 hours 0 minutes" in result["duration"]
 
-    async def test_get_transit_times_cached(self, hass, config_data):
+    async def test_get_transit_times_cached(
+        self, hass, config_data, tool_input, llm_context, mock_cache
+    ):
         """Test that cached results are returned."""
         hass.data[DOMAIN] = {"config": config_data}
 
-        tool = GetTransitTimesTool()
-
         cached_result = {
             "destination": "Times Square",
             "duration": "20 minutes",
             "distance": "5.0 km",
         }
+        mock_cache.get.return_value = cached_result
 
-        tool_input = Mock(spec=llm.ToolInput)
-        tool_input.tool_args = {"destination": "Times Square"}
+        tool = GetTransitTimesTool()
+
+        result = await tool.async_call(hass, tool_input, llm_context)
 
-        llm_context = Mock(spec=llm.LLMContext)
+        assert result == cached_result
+        mock_cache.get.assert_called_once()
+
+    async def test_get_transit_times_reuses_shared_cache(
+        self, hass, config_data, tool_input, llm_context
+    ):
+        """Test that the shared cache is reused and repeat calls are served from memory."""
+        cached_result = {"destination": "Times Square", "duration": "20 minutes"}
+        shared_cache = Mock()
+        shared_cache.get = Mock(return_value=cached_result)
+        hass.data[DOMAIN] = {"config": config_data, "cache": shared_cache}
+
+        tool = GetTransitTimesTool()
 
         with patch(
             "custom_components.llm_intents.GoogleRoutes.SQLiteCache"
         ) as mock_cache:
-            mock_cache_instance = Mock()
-            mock_cache_instance.get = Mock(return_value=cached_result)
-            mock_cache.return_value = mock_cache_instance
-
+            await tool.async_call(hass, tool_input, llm_context)
             result = await tool.async_call(hass, tool_input, llm_context)
 
             assert result == cached_result
-            mock_cache_instance.get.assert_called_once()
+            assert shared_cache.get.call_count == 1
+            mock_cache.assert_not_called()
+
+    async def test_get_transit_times_retries_timeout(
+        self,
+        hass,
+        config_data,
+        tool_input,
+        llm_context,
+        mock_cache,
+        mock_routes_session,
+    ):
+        """Test that a timed out request is retried."""
+        hass.data[DOMAIN] = {"config": config_data}
+        mocked, set_response = mock_routes_session
+        set_response(exception=TimeoutError())
+        set_response({"routes": [{"duration": "1200s", "distanceMeters": 5000}]})
 
-    async def test_get_transit_times_exception(self, hass, config_data):
-        """Test exception handling."""
+        tool = GetTransitTimesTool()
+
+        with patch("custom_components.llm_intents.GoogleRoutes._RETRY_BACKOFF", 0):
+            result = await tool.async_call(hass, tool_input, llm_context)
+
+        assert "20 minutes" in result["duration"]
+        assert len(self.routes_requests(mocked)) == 2
+
+    async def test_get_transit_times_retries_exhausted(
+        self,
+        hass,
+        config_data,
+        tool_input,
+        llm_context,
+        mock_cache,
+        mock_routes_session,
+    ):
+        """Test that an error is returned once every attempt has failed."""
         hass.data[DOMAIN] = {"config": config_data}
+        mocked, set_response = mock_routes_session
+        set_response(exception=aiohttp.ServerDisconnectedError(), repeat=True)
 
         tool = GetTransitTimesTool()
 
-        tool_input = Mock(spec=llm.ToolInput)
-        tool_input.tool_args = {"destination": "Times Square"}
+        with patch("custom_components.llm_intents.GoogleRoutes._RETRY_BACKOFF", 0):
+            result = await tool.async_call(hass, tool_input, llm_context)
+
+        assert "error" in result
+        assert "Error getting route" in result["error"]
+        assert len(self.routes_requests(mocked)) == 3
+        mock_cache.set.assert_not_called()
+
+    async def test_get_transit_times_coalesces_concurrent_calls(
+        self,
+        hass,
+        config_data,
+        tool_input,
+        llm_context,
+        mock_cache,
+        mock_routes_session,
+    ):
+        """Test that concurrent calls for the same route share one API request."""
+        hass.data[DOMAIN] = {"config": config_data}
+        mocked, set_response = mock_routes_session
+        set_response(
+            {"routes": [{"duration": "1200s", "distanceMeters": 5000}]}, repeat=True
+        )
+
+        tool = GetTransitTimesTool()
 
-        llm_context = Mock(spec=llm.LLMContext)
+        results = await asyncio.gather(
+            tool.async_call(hass, tool_input, llm_context),
+            tool.async_call(hass, tool_input, llm_context),
+        )
+
+        assert results[0] == results[1]
+        assert "20 minutes" in results[0]["duration"]
+        assert len(self.routes_requests(mocked)) == 1
+
+    async def test_settings_cached(self, hass, config_data):
+        """Test that settings are parsed once and reused until invalidated."""
+        hass.data[DOMAIN] = {"config": config_data}
+
+        settings = _get_settings(hass)
+
+        assert settings.api_key == config_data[CONF_GOOGLE_PLACES_API_KEY]
+        assert settings.latitude == 40.7128
+        assert settings.longitude == -74.0060
+        assert settings.travel_mode == "DRIVE"
+        assert settings.origin == {
+            "location": {"latLng": {"latitude": 40.7128, "longitude": -74.006}}
+        }
+
+        hass.data[DOMAIN]["config"] = {}
+        assert _get_settings(hass) is settings
+
+        hass.data[DOMAIN].pop("routes_settings")
+        assert _get_settings(hass).api_key is None
+
+    def test_request_body(self):
+        """Test that the request body only carries the fields the API needs."""
+        body = json.loads(
+            _build_body(
+                "Times Square", _build_origin(40.712812345678, -74.0060), "DRIVE"
+            )
+        )
+
+        assert body == {
+            "origin": {
+                "location": {"latLng": {"latitude": 40.712812, "longitude": -74.006}}
+            },
+            "destination": {"address": "Times Square"},
+            "travelMode": "DRIVE",
+            "routingPreference": "TRAFFIC_AWARE",
+        }
+
+        body = json.loads(
+            _build_body("Times Square", _build_origin(40.7128, -74.0060), "WALK")
+        )
+
+        assert body["travelMode"] == "WALK"
+        assert "routingPreference" not in body
+
+    async def test_cache_key(self):
+        """Test that cache keys are stable and vary with the request."""
+        key = _cache_key("Times Square", 40.7128, -74.0060, "DRIVE")
+
+        assert isinstance(key, bytes)
+        assert len(key) == 16
+        assert key == _cache_key("Times Square", 40.7128, -74.0060, "DRIVE")
+        assert key != _cache_key("Times Square", 40.7128, -74.0060, "WALK")
+        assert key != _cache_key("Central Park", 40.7128, -74.0060, "DRIVE")
+
+    async def test_get_transit_times_exception(
+        self, hass, config_data, tool_input, llm_context, mock_cache
+    ):
+        """Test exception handling."""
+        hass.data[DOMAIN] = {"config": config_data}
+
+        tool = GetTransitTimesTool()
 
         with patch(
             "custom_components.llm_intents.GoogleRoutes.async_get_clientsession",
             side_effect=Exception("Network error"),
-        ), patch(
-            "custom_components.llm_intents.GoogleRoutes.SQLiteCache"
-        ) as mock_cache:
-            mock_cache_instance = Mock()
-            mock_cache_instance.get = Mock(return_value=None)
-            mock_cache.return_value = mock_cache_instance
-
+        ):
             result = await tool.async_call(hass, tool_input, llm_context)
 
             assert "error" in result
             assert "Network error" in result["error"]
 
-    async def test_travel_mode_configuration(self, hass):
+    async def test_travel_mode_configuration(
+        self, hass, llm_context, mock_cache, mock_routes_session
+    ):
         """Test different travel modes."""
         travel_modes = ["DRIVE", "WALK", "BICYCLE", "TRANSIT", "TWO_WHEELER"]
+        _, set_response = mock_routes_session
+        set_response(
+            {
+                "routes": [
+                    {
+                        "duration": "600s",
+                        "distanceMeters": 1000,
+                    }
+                ]
+            },
+            repeat=True,
+        )
+
+        tool_input = Mock(spec=llm.ToolInput)
+        tool_input.tool_args = {"destination": "Central Park"}
 
         for mode in travel_modes:
             config = {
                 CONF_GOOGLE_ROUTES_ENABLED: True,
-                CONF_GOOGLE_ROUTES_API_KEY: "test_key",
-                CONF_GOOGLE_ROUTES_LATITUDE: "40.7128",
-                CONF_GOOGLE_ROUTES_LONGITUDE: "-74.0060",
+                CONF_GOOGLE_PLACES_API_KEY: "test_key",
+                CONF_GOOGLE_PLACES_LATITUDE: "40.7128",
+                CONF_GOOGLE_PLACES_LONGITUDE: "-74.0060",
                 CONF_GOOGLE_ROUTES_TRAVEL_MODE: mode,
             }
 
@@ -383,52 +510,55 @@ class TestGoogleRoutes:
 
             tool = GetTransitTimesTool()
 
-            mock_session = AsyncMock()
-            mock_response = AsyncMock()
-            mock_response.status = 200
-            mock_response.json = AsyncMock(
-                return_value={
-                    "routes": [
-                        {
-                            "duration": "600s",
-                            "distanceMeters": 1000,
-                        }
-                    ]
-                }
-            )
-
-            class MockContext:
-                def __init__(self, response):
-                    self.response = response
-
-                async def __aenter__(self):
-                    return self.response
-
-                async def __aexit__(self, *args):
-                    return None
-
-            def mock_post(*args, **kwargs):
-                return MockContext(mock_response)
+            result = await tool.async_call(hass, tool_input, llm_context)
 
-            mock_session.post = mock_post
+            assert "travel_mode" in result
+            assert mode.lower().replace("_", " ") in result["travel_mode"]
+
+    def test_format_duration(self):
+        """Test duration formatting and pluralisation."""
+        assert _format_duration(0) == "0 minutes"
+        assert _format_duration(60) == "1 minute"
+        assert _format_duration(1200) == "20 minutes"
+        assert _format_duration(3660) == "1 hour 1 minute"
+        assert _format_duration(7200) == "2 hours 0 minutes"
+
+    def test_parse_route(self):
+        """Test extracting the first route from a raw response body."""
+        raw = json.dumps(
+            {"routes": [{"duration": "1200s", "distanceMeters": 5000}]}
+        ).encode()
+
+        assert _parse_route(raw) == (1200, 5000)
+        assert _parse_route(b'{"routes": [{}]}') == (0, 0)
+        assert _parse_route(b'{"routes": []}') is None
+        assert _parse_route(b"{}") is None
+
+    def test_hot_cache_expiry(self):
+        """Test that in-memory results expire after the TTL."""
+        with patch(
+            "custom_components.llm_intents.GoogleRoutes.time.monotonic"
+        ) as mock_monotonic:
+            mock_monotonic.return_value = 1000.0
+            _hot_set(b"key", {"result": "value"})
 
-            tool_input = Mock(spec=llm.ToolInput)
-            tool_input.tool_args = {"destination": "Central Park"}
+            mock_monotonic.return_value = 1000.0 + _HOT_TTL - 1
+            assert _hot_get(b"key") == {"result": "value"}
 
-            llm_context = Mock(spec=llm.LLMContext)
+            mock_monotonic.return_value = 1000.0 + _HOT_TTL
+            assert _hot_get(b"key") is None
+            assert b"key" not in _HOT
 
-            with patch(
-                "custom_components.llm_intents.GoogleRoutes.async_get_clientsession",
-                return_value=mock_session,
-            ), patch(
-                "custom_components.llm_intents.GoogleRoutes.SQLiteCache"
-            ) as mock_cache:
-                mock_cache_instance = Mock()
-                mock_cache_instance.get = Mock(return_value=None)
-                mock_cache_instance.set = Mock()
-                mock_cache.return_value = mock_cache_instance
-
-                result = await tool.async_call(hass, tool_input, llm_context)
-
-                assert "travel_mode" in result
-                assert mode.lower().replace("_", " ") in result["travel_mode"]
+    def test_hot_cache_eviction(self):
+        """Test that the oldest in-memory result is evicted when full."""
+        with patch(
+            "custom_components.llm_intents.GoogleRoutes.time.monotonic",
+            return_value=1000.0,
+        ):
+            for i in range(_HOT_MAX_SIZE + 1):
+                _hot_set(i.to_bytes(2), {"result": i})
+
+            assert len(_HOT) == _HOT_MAX_SIZE
+            assert _hot_get((0).to_bytes(2)) is None
+            assert _hot_get((1).to_bytes(2)) == {"result": 1}
+            assert _hot_get(_HOT_MAX_SIZE.to_bytes(2)) == {"result": _HOT_MAX_SIZE}